@@ -4,18 +4,106 @@ SnapControl - Drive Snapshot Backup Wrapper
 Automatisiert Backups mit Drive Snapshot inkl. Differential-Rotation
 """
 
+import atexit
 import json
 import os
+import re
 import sys
 import subprocess
 import socket
 import argparse
+import bisect
+import threading
+import time
+import secrets
+import traceback
+import base64
+import http.client
+import urllib.request
+from urllib.parse import urlsplit, unquote
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from typing import Optional
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Laufwerkstypen von GetDriveTypeW
+DRIVE_REMOVABLE = 2
+DRIVE_FIXED = 3
+
+# Einheiten fuer BackupManager._format_size und _format_duration
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_SECONDS_PER_MINUTE = 60
+_SECONDS_PER_HOUR = 3600
+
+# Maximale Anzahl Eintraege in BackupState.backups
+_MAX_STATE_BACKUPS = 500
+
+# Parallele Loeschauftraege beim Cleanup (ueberlappt die I/O-Wartezeiten)
+_DELETE_WORKERS = 8
+
+# Maximale Verzoegerung (Sekunden), bis gepufferte Log-Zeilen in der Datei stehen
+_LOG_FLUSH_INTERVAL = 1.0
+
+# Kernel32-Funktionen einmalig mit Prototypen binden (nur Windows)
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _GetLogicalDrives = _kernel32.GetLogicalDrives
+    _GetLogicalDrives.argtypes = []
+    _GetLogicalDrives.restype = wintypes.DWORD
+
+    _GetDriveTypeW = _kernel32.GetDriveTypeW
+    _GetDriveTypeW.argtypes = [wintypes.LPCWSTR]
+    _GetDriveTypeW.restype = wintypes.UINT
+
+    _GetVolumeInformationW = _kernel32.GetVolumeInformationW
+    _GetVolumeInformationW.argtypes = [
+        wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD,
+        wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPDWORD,
+        wintypes.LPWSTR, wintypes.DWORD
+    ]
+    _GetVolumeInformationW.restype = wintypes.BOOL
+
+    _GetDiskFreeSpaceExW = _kernel32.GetDiskFreeSpaceExW
+    _GetDiskFreeSpaceExW.argtypes = [
+        wintypes.LPCWSTR,
+        ctypes.POINTER(ctypes.c_ulonglong),
+        ctypes.POINTER(ctypes.c_ulonglong),
+        ctypes.POINTER(ctypes.c_ulonglong)
+    ]
+    _GetDiskFreeSpaceExW.restype = wintypes.BOOL
+else:
+    _kernel32 = None
+
+
+def _disk_free(path) -> tuple[int, int, int]:
+    """
+    Gibt (total, free, used) in Bytes fuer das Laufwerk von path zurueck
+    Wirft OSError wenn der Speicherplatz nicht ermittelt werden kann
+    """
+    if _kernel32 is None:
+        import shutil
+        usage = shutil.disk_usage(path)
+        return usage.total, usage.free, usage.used
+
+    total = ctypes.c_ulonglong()
+    free = ctypes.c_ulonglong()
+    if not _GetDiskFreeSpaceExW(str(path), None, ctypes.byref(total), ctypes.byref(free)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return total.value, free.value, total.value - free.value
+
 
 class BackupType(Enum):
     FULL = "full"
@@ -49,9 +137,87 @@ class BackupState:
     last_full_backup: Optional[str] = None
     last_full_hash_file: Optional[str] = None
     differential_count: int = 0
+    last_cycle_size_bytes: int = 0  # Groesse des aktuellen Zyklus (0 = unbekannt)
     backups: list = field(default_factory=list)
 
 
+def _dumps(data) -> bytes:
+    """Serialisiert data als eingeruecktes UTF-8-JSON (mit orjson falls installiert)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_compact(data) -> bytes:
+    """Serialisiert data als kompaktes JSON fuer die Uebertragung (ohne Leerzeichen)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    # ensure_ascii nutzt den schnellen ASCII-Pfad des C-Encoders,
+    # Nicht-ASCII-Zeichen werden als \uXXXX maskiert
+    return json.dumps(data, separators=(",", ":")).encode("ascii")
+
+
+def _write_bytes(path, data: bytes):
+    """Schreibt bereits serialisierte Bytes ungepuffert, im Normalfall mit einem write()"""
+    with open(path, "wb", buffering=0) as f:
+        view = memoryview(data)
+        # FileIO.write darf weniger Bytes schreiben als uebergeben
+        while view:
+            view = view[f.write(view):]
+
+
+_HOSTNAME = None
+
+
+def _get_hostname() -> str:
+    """Gibt den Rechnernamen zurueck (einmal pro Prozess ermittelt)"""
+    global _HOSTNAME
+    if _HOSTNAME is None:
+        _HOSTNAME = socket.gethostname()
+    return _HOSTNAME
+
+
+# Zeitstempel im Backup-Dateinamen (z.B. D_full_20260107_202812.sna, D_diff_20260107_210716_#01.sna)
+_TS_RE = re.compile(r"_(?:full|diff)_(\d{8}_\d{6})")
+
+
+def _parse_backup_timestamp(name: str) -> Optional[datetime]:
+    """Liest den Zeitstempel aus einem Backup-Dateinamen, None wenn nicht vorhanden"""
+    m = _TS_RE.search(name)
+    if m:
+        try:
+            return datetime.strptime(m.group(1), "%Y%m%d_%H%M%S")
+        except ValueError:
+            pass
+    return None
+
+
+# Dateiendungen von Drive Snapshot: Image, Hash und Split-Dateien (.sn1-.sn9, .s10-.s99)
+_BACKUP_SUFFIXES = frozenset(
+    [".sna", ".hsh"]
+    + [f".sn{i}" for i in range(1, 10)]
+    + [f".s{i}" for i in range(10, 100)]
+)
+
+
+def _index_directory(path: Path) -> dict:
+    """
+    Liest die Backup-Dateien eines Verzeichnisses einmalig per os.scandir ein
+    Gibt {Dateistamm: [os.DirEntry, ...]} zurueck (Stamm = Name bis zum ersten Punkt)
+    Dateien mit fremden Endungen werden ignoriert (und damit nie geloescht)
+    """
+    index = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if (os.path.splitext(entry.name)[1].lower() in _BACKUP_SUFFIXES
+                        and entry.is_file()):
+                    index.setdefault(entry.name.split(".", 1)[0], []).append(entry)
+    except FileNotFoundError:
+        pass
+    return index
+
+
 @dataclass
 class BackupCycle:
     """Repraesentiert einen Backup-Zyklus (Vollbackup + Differentials)"""
@@ -61,24 +227,24 @@ class BackupCycle:
     timestamp: datetime
     total_size_bytes: int = 0
 
-    def get_all_files(self) -> list:
-        """Gibt alle Dateien des Zyklus zurueck (inkl. Split-Dateien)"""
-        files = []
-        # Vollbackup und alle Split-Dateien (.sna, .sn1, .sn2, ... .s10, .s11, etc.)
-        base_name = self.full_backup.stem
-        parent = self.full_backup.parent
-        for f in parent.glob(f"{base_name}.*"):
-            files.append(f)
-        # Hash-Datei
-        if self.hash_file and self.hash_file.exists():
-            files.append(self.hash_file)
-        # Differentials und deren Split-Dateien
-        for diff in self.differentials:
-            diff_base = diff.stem
-            diff_parent = diff.parent
-            for f in diff_parent.glob(f"{diff_base}.*"):
-                files.append(f)
-        return files
+    def get_all_files(self, index: dict = None) -> list:
+        """
+        Gibt alle Dateien des Zyklus als os.DirEntry zurueck (inkl. Split- und Hash-Dateien)
+        index: Verzeichnis-Index {Verzeichnispfad (str): _index_directory(...)}, fehlende
+        Verzeichnisse werden einmalig eingelesen
+        """
+        if index is None:
+            index = {}
+        entries = []
+        # Vollbackup, Differentials und alle Split-Dateien (.sna, .sn1, ... .s10, .s11, etc.)
+        # inkl. Hash-Datei mit gleichem Stamm; scandir liefert nur existierende Dateien.
+        # os.path statt pathlib, um keine Path-Objekte pro Datei zu erzeugen
+        for image in [self.full_backup] + self.differentials:
+            parent = os.path.dirname(image)
+            if parent not in index:
+                index[parent] = _index_directory(parent)
+            entries.extend(index[parent].get(os.path.basename(image).split(".", 1)[0], []))
+        return entries
 
 
 @dataclass
@@ -104,6 +270,10 @@ class DiskSpaceInfo:
         return self.last_cycle_size_bytes / (1024**3)
 
 
+# Platzhalter fuer Zusammenfassungen ohne Speicherplatz-Informationen
+_EMPTY_DISK_INFO = DiskSpaceInfo(0, 0, 0, 0, 0, False)
+
+
 @dataclass
 class TargetDisk:
     """Repraesentiert ein erkanntes Backup-Ziel-Laufwerk"""
@@ -136,81 +306,128 @@ class DiskScanner:
         # Mapping von Disk-ID zu Config
         self.disk_config_map = {d["id"]: d for d in self.target_disks_config}
 
+        # Ergebnis von get_available_drives()
+        self._available_drives: Optional[list] = None
+
+        # Wiederverwendete Puffer fuer Volume-Labels, einer pro Thread (Laufwerke
+        # werden parallel abgefragt)
+        self._thread_local = threading.local()
+
     def get_available_drives(self) -> list:
-        """Gibt alle verfuegbaren Laufwerksbuchstaben zurueck (Windows)"""
+        """
+        Gibt alle verfuegbaren Laufwerksbuchstaben zurueck (Windows)
+        Nur lokale Fest- und Wechseldatentraeger, das Ergebnis wird pro Scanner gecacht
+        """
+        if self._available_drives is not None:
+            return self._available_drives
+
         import string
         drives = []
-        for letter in string.ascii_uppercase:
-            drive_path = Path(f"{letter}:")
-            if drive_path.exists():
-                try:
-                    # Pruefen ob Laufwerk zugreifbar ist
-                    list(drive_path.iterdir())
+        if _kernel32 is None:
+            # Kein Windows
+            self._available_drives = drives
+            return drives
+
+        # Ein Aufruf liefert alle Laufwerke als Bitmaske (Bit 0 = A:),
+        # ohne die Laufwerke selbst anzufassen (weckt keine schlafenden Platten)
+        drive_mask = _GetLogicalDrives()
+        for i, letter in enumerate(string.ascii_uppercase):
+            if drive_mask & (1 << i):
+                drive_type = _GetDriveTypeW(f"{letter}:\\")
+                if drive_type in (DRIVE_REMOVABLE, DRIVE_FIXED):
                     drives.append(letter)
-                except (PermissionError, OSError):
-                    pass
+
+        self._available_drives = drives
         return drives
 
-    def read_disk_id(self, drive_letter: str) -> Optional[str]:
-        """Liest die Disk-ID aus der ID-Datei auf dem Laufwerk"""
-        id_file = Path(f"{drive_letter}:") / self.id_filename
+    def read_disk_id(self, drive_letter: str, drive_root: Path = None) -> Optional[str]:
+        """
+        Liest die Disk-ID aus der ID-Datei auf dem Laufwerk
+        drive_root: bereits erstellter Pfad des Laufwerks-Root (z.B. Path("E:\\"))
+        """
+        id_file = (drive_root or Path(f"{drive_letter}:\\")) / self.id_filename
         try:
-            if id_file.exists():
-                content = id_file.read_text(encoding="utf-8").strip()
-                return content if content else None
+            content = id_file.read_text(encoding="utf-8").strip()
+            return content if content else None
         except (PermissionError, OSError):
+            # Auch FileNotFoundError: keine ID-Datei vorhanden
             pass
         return None
 
-    def get_volume_label(self, drive_letter: str) -> str:
+    def get_volume_label(self, drive_letter: str, drive_root: Path = None) -> str:
         """Gibt das Volume-Label des Laufwerks zurueck"""
+        if _kernel32 is None:
+            return ""
         try:
-            import ctypes
-            kernel32 = ctypes.windll.kernel32
-            volume_name = ctypes.create_unicode_buffer(1024)
-            kernel32.GetVolumeInformationW(
-                f"{drive_letter}:\\",
-                volume_name, 1024,
+            volume_buffer = getattr(self._thread_local, "volume_buffer", None)
+            if volume_buffer is None:
+                # max. MAX_PATH + 1 Zeichen
+                volume_buffer = self._thread_local.volume_buffer = ctypes.create_unicode_buffer(261)
+            if not _GetVolumeInformationW(
+                str(drive_root) if drive_root else f"{drive_letter}:\\",
+                volume_buffer, len(volume_buffer),
                 None, None, None, None, 0
-            )
-            return volume_name.value
+            ):
+                return ""
+            return volume_buffer.value
         except Exception:
             return ""
 
+    def _probe_drive(self, drive_letter: str, drive_root: Path) -> tuple:
+        """
+        Fragt ein Laufwerk ab
+        Gibt (disk_id, volume_label, total_bytes, free_bytes) zurueck,
+        Speicherplatz nur fuer bekannte Disk-IDs
+        """
+        disk_id = self.read_disk_id(drive_letter, drive_root)
+        volume_label = self.get_volume_label(drive_letter, drive_root)
+        total_bytes = 0
+        free_bytes = 0
+        if disk_id in self.disk_config_map:
+            try:
+                total_bytes, free_bytes, _ = _disk_free(drive_root)
+            except Exception:
+                pass
+        return disk_id, volume_label, total_bytes, free_bytes
+
     def scan_for_target_disks(self) -> list:
         """
         Scannt alle Laufwerke und gibt erkannte Backup-Laufwerke zurueck
         Nur Laufwerke mit bekannter ID werden zurueckgegeben
         """
-        import shutil
         found_disks = []
         known_ids = set(self.disk_config_map.keys())
 
         self.logger.info("=== Laufwerks-Scan ===")
 
-        for drive_letter in self.get_available_drives():
-            disk_id = self.read_disk_id(drive_letter)
-            volume_label = self.get_volume_label(drive_letter)
+        # Root-Pfade einmal pro Laufwerk erstellen
+        drive_roots = {letter: Path(f"{letter}:\\") for letter in self.get_available_drives()}
+
+        # Laufwerke parallel abfragen, damit sich Anlaufzeiten nicht aufsummieren
+        probes = {}
+        if drive_roots:
+            with ThreadPoolExecutor(max_workers=len(drive_roots)) as executor:
+                futures = {
+                    executor.submit(self._probe_drive, letter, root): letter
+                    for letter, root in drive_roots.items()
+                }
+                for future in as_completed(futures):
+                    probes[futures[future]] = future.result()
+
+        # Ergebnisse in Laufwerksreihenfolge auswerten
+        for drive_letter, drive_root in drive_roots.items():
+            disk_id, volume_label, total_bytes, free_bytes = probes[drive_letter]
 
             if disk_id:
                 if disk_id in known_ids:
                     # Bekanntes Backup-Laufwerk gefunden
                     disk_config = self.disk_config_map[disk_id]
-                    drive_path = Path(f"{drive_letter}:")
-
-                    try:
-                        usage = shutil.disk_usage(drive_path)
-                        total_bytes = usage.total
-                        free_bytes = usage.free
-                    except Exception:
-                        total_bytes = 0
-                        free_bytes = 0
 
                     target_disk = TargetDisk(
                         disk_id=disk_id,
                         name=disk_config.get("name", disk_id),
                         drive_letter=drive_letter,
-                        base_path=Path(f"{drive_letter}:\\") / disk_config.get("base_path", "Backups"),
+                        base_path=drive_root / disk_config.get("base_path", "Backups"),
                         volume_label=volume_label,
                         total_bytes=total_bytes,
                         free_bytes=free_bytes
@@ -243,7 +460,7 @@ class DiskScanner:
 
     def create_id_file(self, drive_letter: str, disk_id: str) -> bool:
         """Erstellt eine ID-Datei auf einem Laufwerk (fuer Setup)"""
-        id_file = Path(f"{drive_letter}:") / self.id_filename
+        id_file = Path(f"{drive_letter}:\\") / self.id_filename
         try:
             id_file.write_text(disk_id, encoding="utf-8")
             return True
@@ -264,50 +481,66 @@ class BackupLogger:
         self.text_log_path = self.log_dir / f"backup_{timestamp}.log"
         self.json_log_path = self.log_dir / f"backup_{timestamp}.json"
 
+        # Ein Handle fuer die ganze Session statt open/close pro Zeile
+        self._text_fh = open(self.text_log_path, "a", encoding="utf-8", buffering=64 * 1024)
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+        # Konsolenausgabe nur bei interaktivem Aufruf (nicht als geplanter Task)
+        self._echo = sys.stdout is not None and sys.stdout.isatty()
+
         self.entries = []
+        # Zaehler werden beim Schreiben gepflegt, die Zusammenfassung muss nicht zaehlen
+        self.error_count = 0
+        self.warning_count = 0
         self._log_text(f"=== SnapControl Backup Session {session_id} ===")
         self._log_text(f"Gestartet: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         self._log_text("=" * 50)
 
-    def _log_text(self, message: str):
-        """Schreibt ins Text-Log"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def _log_text(self, message: str, timestamp: str = None, flush: bool = False):
+        """
+        Schreibt ins Text-Log (gepuffert, Warnungen/Fehler sofort)
+        Spaetestens nach _LOG_FLUSH_INTERVAL Sekunden wird geflusht, damit das Log bei
+        laufendem Backup aktuell bleibt und bei hartem Abbruch kaum etwas verloren geht
+        """
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         line = f"[{timestamp}] {message}"
-        print(line)
-        with open(self.text_log_path, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
-
-    def info(self, message: str):
-        self._log_text(f"INFO: {message}")
+        if self._echo:
+            print(line)
+        self._text_fh.write(line + "\n")
+        now = time.monotonic()
+        if flush or now - self._last_flush >= _LOG_FLUSH_INTERVAL:
+            self._text_fh.flush()
+            self._last_flush = now
+
+    def close(self):
+        """Schliesst das Text-Log"""
+        if not self._text_fh.closed:
+            self._text_fh.close()
+
+    def _log(self, level: str, label: str, message: str, flush: bool = False):
+        """Schreibt einen Eintrag ins Text-Log und in die JSON-Eintraege (ein Zeitstempel)"""
+        now = datetime.now()
+        self._log_text(f"{label}: {message}", now.strftime("%Y-%m-%d %H:%M:%S"), flush)
         self.entries.append({
-            "timestamp": datetime.now().isoformat(),
-            "level": "INFO",
+            "timestamp": now.isoformat(),
+            "level": level,
             "message": message
         })
 
+    def info(self, message: str):
+        self._log("INFO", "INFO", message)
+
     def warning(self, message: str):
-        self._log_text(f"WARNUNG: {message}")
-        self.entries.append({
-            "timestamp": datetime.now().isoformat(),
-            "level": "WARNING",
-            "message": message
-        })
+        self.warning_count += 1
+        self._log("WARNING", "WARNUNG", message, flush=True)
 
     def error(self, message: str):
-        self._log_text(f"FEHLER: {message}")
-        self.entries.append({
-            "timestamp": datetime.now().isoformat(),
-            "level": "ERROR",
-            "message": message
-        })
+        self.error_count += 1
+        self._log("ERROR", "FEHLER", message, flush=True)
 
     def success(self, message: str):
-        self._log_text(f"ERFOLG: {message}")
-        self.entries.append({
-            "timestamp": datetime.now().isoformat(),
-            "level": "SUCCESS",
-            "message": message
-        })
+        self._log("SUCCESS", "ERFOLG", message)
 
     def save_json_log(self, result: BackupResult):
         """Speichert das JSON-Log"""
@@ -316,9 +549,8 @@ class BackupLogger:
             "entries": self.entries,
             "result": asdict(result)
         }
-        with open(self.json_log_path, "w", encoding="utf-8") as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
-        self._log_text(f"JSON-Log gespeichert: {self.json_log_path}")
+        _write_bytes(self.json_log_path, _dumps(log_data))
+        self._log_text(f"JSON-Log gespeichert: {self.json_log_path}", flush=True)
 
 
 class SnapshotWrapper:
@@ -377,28 +609,60 @@ class SnapshotWrapper:
         return self._run_command(cmd)
 
     def _run_command(self, cmd: list) -> tuple[int, str]:
-        """Fuehrt Kommando aus und gibt (exit_code, output) zurueck"""
+        """
+        Fuehrt Kommando aus und gibt (exit_code, output) zurueck
+        Die Ausgabe wird zeilenweise ins Log gestreamt, behalten werden nur die letzten Zeilen
+        """
+        tail = deque(maxlen=2000)
+        timed_out = threading.Event()
+
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=7200  # 2 Stunden Timeout
+                errors="replace",
+                bufsize=1
             )
-            output = result.stdout + result.stderr
-
-            for line in output.strip().split("\n"):
-                if line.strip():
-                    self.logger.info(f"  > {line.strip()}")
+        except Exception as e:
+            self.logger.error(f"Fehler beim Ausfuehren: {e}")
+            return -1, str(e)
 
-            return result.returncode, output
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
 
-        except subprocess.TimeoutExpired:
-            self.logger.error("Backup Timeout nach 2 Stunden")
-            return -1, "Timeout"
+        # 2 Stunden Timeout, greift auch waehrend auf Ausgabe gewartet wird
+        timer = threading.Timer(7200, kill_on_timeout)
+        timer.daemon = True
+        timer.start()
+        try:
+            for line in proc.stdout:
+                line = line.strip()
+                if line:
+                    self.logger.info(f"  > {line}")
+                tail.append(line)
+            proc.wait()
         except Exception as e:
+            proc.kill()
+            proc.wait()
             self.logger.error(f"Fehler beim Ausfuehren: {e}")
             return -1, str(e)
+        except BaseException:
+            # KeyboardInterrupt/SystemExit: snapshot.exe nicht weiterlaufen lassen
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+
+        if timed_out.is_set():
+            self.logger.error("Backup Timeout nach 2 Stunden")
+            return -1, "Timeout"
+
+        return proc.returncode, "\n".join(tail)
 
 
 class BackupManager:
@@ -410,8 +674,12 @@ class BackupManager:
         self.target_disk = target_disk
         self.source_drive = config["source_drive"]
         self.max_differentials = config["max_differential_backups"]
-        self.computer_name = config.get("hostname") or socket.gethostname()
+        self.computer_name = config.get("hostname") or _get_hostname()
         self.verify = config.get("verify_after_backup", True)
+        # Verify pro Backup-Art: Vollbackups wie verify_after_backup, Differentials
+        # standardmaessig ohne (klein und schnell neu erstellt, -T liest das ganze Image)
+        self.verify_full = config.get("verify_full", self.verify)
+        self.verify_differential = config.get("verify_differential", False)
 
         # Retention-Einstellungen
         retention = config.get("retention", {})
@@ -437,6 +705,16 @@ class BackupManager:
             snapshot_path = Path(__file__).parent / snapshot_path
         self.wrapper = SnapshotWrapper(snapshot_path, logger)
 
+        # Verzeichnis-Index des letzten get_backup_cycles() (fuer Cleanup)
+        self._dir_index: Optional[dict] = None
+
+        # Ergebnis von get_backup_cycles() und Aenderungszeiten der Verzeichnisse dazu
+        self._cycles_cache: Optional[list] = None
+        self._cycles_cache_mtime: Optional[tuple] = None
+
+        # Ergebnis von get_disk_space_info() bis zum naechsten Schreiben/Loeschen
+        self._disk_cache: Optional[DiskSpaceInfo] = None
+
         # State laden
         self.state = self._load_state()
 
@@ -450,6 +728,7 @@ class BackupManager:
                         last_full_backup=data.get("last_full_backup"),
                         last_full_hash_file=data.get("last_full_hash_file"),
                         differential_count=data.get("differential_count", 0),
+                        last_cycle_size_bytes=data.get("last_cycle_size_bytes", 0),
                         backups=data.get("backups", [])
                     )
                     self.logger.info(f"State geladen: {self.state_file}")
@@ -459,10 +738,23 @@ class BackupManager:
         return BackupState()
 
     def _save_state(self):
-        """Speichert den Backup-Status"""
+        """
+        Speichert den Backup-Status
+        Atomar ueber eine temporaere Datei, damit ein Abbruch beim Schreiben keinen
+        halben State hinterlaesst (der naechste Lauf wuerde sonst ein Vollbackup machen)
+        """
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, "w", encoding="utf-8") as f:
-            json.dump(asdict(self.state), f, indent=2, ensure_ascii=False)
+        tmp_file = self.state_file.with_suffix(".json.tmp")
+        data = {
+            "last_full_backup": self.state.last_full_backup,
+            "last_full_hash_file": self.state.last_full_hash_file,
+            "differential_count": self.state.differential_count,
+            "last_cycle_size_bytes": self.state.last_cycle_size_bytes,
+            # backups ist bereits eine Liste von dicts, kein asdict()-Deepcopy noetig
+            "backups": self.state.backups
+        }
+        _write_bytes(tmp_file, _dumps(data))
+        os.replace(tmp_file, self.state_file)
         self.logger.info(f"State gespeichert: {self.state_file}")
 
     def setup_directory_structure(self):
@@ -523,7 +815,7 @@ class BackupManager:
             exit_code, output = self.wrapper.create_full_backup(
                 self.source_drive,
                 image_path,
-                self.verify
+                self.verify_full
             )
 
             # State aktualisieren bei Erfolg
@@ -541,13 +833,16 @@ class BackupManager:
                 self.source_drive,
                 image_path,
                 hash_path,
-                self.verify
+                self.verify_differential
             )
 
             # State aktualisieren bei Erfolg
             if exit_code == 0:
                 self.state.differential_count = diff_num
 
+        # Neue Image-Dateien -> gecachte Zyklen sind veraltet
+        self._invalidate_caches()
+
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
 
@@ -556,6 +851,15 @@ class BackupManager:
         if image_path.exists():
             file_size = image_path.stat().st_size
 
+        # Zyklusgroesse im State fortschreiben (inkl. Split- und Hash-Dateien),
+        # damit get_disk_space_info() nicht alle Zyklen scannen muss
+        if exit_code == 0:
+            image_size = self._image_size(image_path)
+            if backup_type == BackupType.FULL:
+                self.state.last_cycle_size_bytes = image_size
+            elif self.state.last_cycle_size_bytes:
+                self.state.last_cycle_size_bytes += image_size
+
         # Ergebnis erstellen
         result = BackupResult(
             success=(exit_code == 0),
@@ -584,6 +888,8 @@ class BackupManager:
             "file": str(image_path),
             "success": result.success
         })
+        # Historie begrenzen, damit der State nicht unbegrenzt waechst
+        del self.state.backups[:-_MAX_STATE_BACKUPS]
 
         # State speichern
         self._save_state()
@@ -600,106 +906,133 @@ class BackupManager:
 
         return result
 
+    @staticmethod
+    def _image_size(image_path: Path) -> int:
+        """Gibt die Groesse eines Images inkl. Split-Dateien (und ggf. Hash-Datei) zurueck"""
+        entries = _index_directory(image_path.parent).get(image_path.name.split(".", 1)[0], [])
+        return sum(e.stat().st_size for e in entries)
+
     @staticmethod
     def _format_size(size_bytes: int) -> str:
         """Formatiert Bytes in lesbare Groesse"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.2f} PB"
+        size_bytes = int(size_bytes)
+        if size_bytes <= 0:
+            return "0.00 B"
+        # Einheit direkt aus der Bitlaenge (2^10 pro Stufe) statt wiederholt zu teilen
+        unit = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (unit * 10)):.2f} {_SIZE_UNITS[unit]}"
 
     @staticmethod
     def _format_duration(seconds: float) -> str:
         """Formatiert Sekunden in lesbare Dauer"""
-        if seconds < 60:
+        if seconds < _SECONDS_PER_MINUTE:
             return f"{seconds:.1f} Sekunden"
-        elif seconds < 3600:
-            mins = int(seconds // 60)
-            secs = int(seconds % 60)
+        whole_seconds = int(seconds)
+        if seconds < _SECONDS_PER_HOUR:
+            mins, secs = divmod(whole_seconds, _SECONDS_PER_MINUTE)
             return f"{mins} Min {secs} Sek"
-        else:
-            hours = int(seconds // 3600)
-            mins = int((seconds % 3600) // 60)
-            return f"{hours} Std {mins} Min"
+        hours, rest = divmod(whole_seconds, _SECONDS_PER_HOUR)
+        return f"{hours} Std {rest // _SECONDS_PER_MINUTE} Min"
+
+    def _invalidate_caches(self):
+        """Verwirft gecachte Verzeichnis-Ergebnisse (nach Schreiben/Loeschen)"""
+        self._dir_index = None
+        self._cycles_cache = None
+        self._cycles_cache_mtime = None
+        self._disk_cache = None
 
     def get_backup_cycles(self) -> list:
         """
         Ermittelt alle Backup-Zyklen (Vollbackup + zugehoerige Differentials)
         Sortiert nach Datum (aelteste zuerst)
+        Das Ergebnis wird gecacht, solange sich die Backup-Verzeichnisse nicht aendern
         """
         cycles = []
-        full_dir = self.backup_dir / "full"
-        diff_dir = self.backup_dir / "differential"
+        # Intern mit str-Pfaden arbeiten, Path nur fuer die BackupCycle-Felder
+        full_dir = os.path.join(self.backup_dir, "full")
+        diff_dir = os.path.join(self.backup_dir, "differential")
 
-        if not full_dir.exists():
+        try:
+            full_mtime = os.stat(full_dir).st_mtime_ns
+        except FileNotFoundError:
             return cycles
+        try:
+            diff_mtime = os.stat(diff_dir).st_mtime_ns
+        except FileNotFoundError:
+            diff_mtime = None
+
+        fingerprint = (full_mtime, diff_mtime)
+        if self._cycles_cache is not None and self._cycles_cache_mtime == fingerprint:
+            return self._cycles_cache
+
+        # Beide Verzeichnisse einmalig einlesen
+        index = {
+            full_dir: _index_directory(full_dir),
+            diff_dir: _index_directory(diff_dir),
+        }
+        self._dir_index = index
 
         # Alle Vollbackups finden (nur .sna Dateien, keine Split-Dateien)
-        full_backups = sorted(full_dir.glob("*_full_*.sna"))
-
-        for full_backup in full_backups:
-            # Timestamp aus Dateinamen extrahieren (Format: D_full_20260107_202812.sna)
-            name_parts = full_backup.stem.split("_")
-            if len(name_parts) >= 4:
-                try:
-                    timestamp_str = f"{name_parts[2]}_{name_parts[3]}"
-                    timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                except ValueError:
-                    timestamp = datetime.fromtimestamp(full_backup.stat().st_mtime)
-            else:
-                timestamp = datetime.fromtimestamp(full_backup.stat().st_mtime)
+        full_entries = sorted(
+            (e for entries in index[full_dir].values() for e in entries
+             if "_full_" in e.name and e.name.lower().endswith(".sna")),
+            key=lambda e: e.name
+        )
+        full_names = {e.name.lower() for entries in index[full_dir].values() for e in entries}
+
+        for entry in full_entries:
+            # Timestamp aus Dateinamen extrahieren, Aenderungszeit nur als Fallback
+            timestamp = (_parse_backup_timestamp(entry.name)
+                         or datetime.fromtimestamp(entry.stat().st_mtime))
 
             # Hash-Datei finden
-            hash_file = full_backup.with_suffix(".hsh")
-            if not hash_file.exists():
-                hash_file = None
-
-            # Zugehoerige Differentials finden (basierend auf Hash-Datei-Referenz)
-            differentials = []
-            if diff_dir.exists():
-                # Differentials die nach diesem Vollbackup erstellt wurden
-                # und vor dem naechsten Vollbackup
-                for diff in sorted(diff_dir.glob("*_diff_*.sna")):
-                    diff_time = datetime.fromtimestamp(diff.stat().st_mtime)
-                    if diff_time >= timestamp:
-                        # Pruefen ob es ein neueres Vollbackup gibt
-                        is_for_this_cycle = True
-                        for other_full in full_backups:
-                            if other_full != full_backup:
-                                other_time = datetime.fromtimestamp(other_full.stat().st_mtime)
-                                if timestamp < other_time <= diff_time:
-                                    is_for_this_cycle = False
-                                    break
-                        if is_for_this_cycle:
-                            differentials.append(diff)
-
-            # Gesamtgroesse berechnen
-            cycle = BackupCycle(
-                full_backup=full_backup,
+            hash_name = os.path.splitext(entry.name)[0] + ".hsh"
+            hash_file = None
+            if hash_name.lower() in full_names:
+                hash_file = Path(os.path.join(full_dir, hash_name))
+
+            cycles.append(BackupCycle(
+                full_backup=Path(entry.path),
                 hash_file=hash_file,
-                differentials=differentials,
+                differentials=[],
                 timestamp=timestamp
-            )
-
-            # Groesse aller Dateien im Zyklus berechnen
-            total_size = 0
-            for f in cycle.get_all_files():
-                if f.exists():
-                    total_size += f.stat().st_size
-            cycle.total_size_bytes = total_size
-
-            cycles.append(cycle)
+            ))
 
         # Nach Timestamp sortieren (aelteste zuerst)
         cycles.sort(key=lambda c: c.timestamp)
+        cycle_times = [c.timestamp for c in cycles]
+
+        # Jedes Differential gehoert zum juengsten Vollbackup, das vor ihm erstellt wurde
+        diff_entries = sorted(
+            (e for entries in index[diff_dir].values() for e in entries
+             if "_diff_" in e.name and e.name.lower().endswith(".sna")),
+            key=lambda e: e.name
+        )
+        for entry in diff_entries:
+            diff_time = (_parse_backup_timestamp(entry.name)
+                         or datetime.fromtimestamp(entry.stat().st_mtime))
+            idx = bisect.bisect_right(cycle_times, diff_time) - 1
+            if idx >= 0:
+                cycles[idx].differentials.append(Path(entry.path))
+
+        # Groesse aller Dateien im Zyklus berechnen
+        for cycle in cycles:
+            # DirEntry.stat() ist von scandir gecacht; unter Windows kommt die Groesse
+            # direkt aus dem Verzeichnislisting (auch auf Netzlaufwerken kein
+            # Roundtrip pro Datei), ein Thread-Pool fuer stat() bringt hier nichts
+            cycle.total_size_bytes = sum(e.stat().st_size for e in cycle.get_all_files(index))
+
+        self._cycles_cache = cycles
+        self._cycles_cache_mtime = fingerprint
         return cycles
 
     def get_disk_space_info(self) -> DiskSpaceInfo:
         """
         Ermittelt Speicherplatz-Informationen inkl. Schaetzung fuer naechstes Backup
+        Das Ergebnis wird bis zum naechsten Backup bzw. Cleanup gecacht
         """
-        import shutil
+        if self._disk_cache is not None:
+            return self._disk_cache
 
         # Freien Speicherplatz auf Ziel-Laufwerk ermitteln
         target_path = self.backup_dir
@@ -707,10 +1040,7 @@ class BackupManager:
             target_path = self.target_base
 
         try:
-            disk_usage = shutil.disk_usage(target_path)
-            total_bytes = disk_usage.total
-            free_bytes = disk_usage.free
-            used_bytes = disk_usage.used
+            total_bytes, free_bytes, used_bytes = _disk_free(target_path)
         except Exception as e:
             self.logger.error(f"Konnte Speicherplatz nicht ermitteln: {e}")
             return DiskSpaceInfo(
@@ -718,11 +1048,15 @@ class BackupManager:
                 last_cycle_size_bytes=0, required_bytes=0, has_enough_space=False
             )
 
-        # Groesse des letzten Zyklus ermitteln
-        cycles = self.get_backup_cycles()
-        last_cycle_size = 0
-        if cycles:
-            last_cycle_size = cycles[-1].total_size_bytes
+        # Groesse des letzten Zyklus aus dem State, nur wenn unbekannt oder das
+        # Vollbackup nicht mehr existiert alle Zyklen scannen
+        last_cycle_size = self.state.last_cycle_size_bytes
+        if not last_cycle_size or not (self.state.last_full_backup
+                                       and Path(self.state.last_full_backup).exists()):
+            cycles = self.get_backup_cycles()
+            last_cycle_size = 0
+            if cycles:
+                last_cycle_size = cycles[-1].total_size_bytes
 
         # Benoetigter Platz mit Reserve berechnen
         reserve_factor = 1 + (self.space_reserve_percent / 100)
@@ -734,7 +1068,7 @@ class BackupManager:
 
         has_enough = free_bytes >= required_bytes
 
-        return DiskSpaceInfo(
+        self._disk_cache = DiskSpaceInfo(
             total_bytes=total_bytes,
             free_bytes=free_bytes,
             used_bytes=used_bytes,
@@ -742,6 +1076,7 @@ class BackupManager:
             required_bytes=required_bytes,
             has_enough_space=has_enough
         )
+        return self._disk_cache
 
     def log_disk_space(self) -> DiskSpaceInfo:
         """Loggt die Speicherplatzverhältnisse"""
@@ -763,6 +1098,16 @@ class BackupManager:
 
         return info
 
+    @staticmethod
+    def _delete_entry(entry: os.DirEntry) -> int:
+        """
+        Loescht eine Datei und gibt ihre Groesse zurueck
+        Kein exists() vorab, eine fehlende Datei wirft FileNotFoundError
+        """
+        file_size = entry.stat(follow_symlinks=False).st_size
+        os.unlink(entry.path)
+        return file_size
+
     def cleanup_old_cycles(self, dry_run: bool = False) -> dict:
         """
         Loescht alte Backup-Zyklen, behaelt nur die konfigurierten Anzahl
@@ -795,30 +1140,50 @@ class BackupManager:
         self.logger.info(f"  Zu behalten: {self.keep_cycles}")
         self.logger.info(f"  Zu loeschen: {len(cycles_to_delete)}")
 
-        for cycle in cycles_to_delete:
-            self.logger.info(f"  Loesche Zyklus vom {cycle.timestamp.strftime('%Y-%m-%d %H:%M')}")
-            self.logger.info(f"    Vollbackup: {cycle.full_backup.name}")
-            self.logger.info(f"    Differentials: {len(cycle.differentials)}")
-            self.logger.info(f"    Groesse: {self._format_size(cycle.total_size_bytes)}")
-
-            if dry_run:
-                self.logger.info(f"    [DRY-RUN] Wuerde loeschen")
-                stats["freed_bytes"] += cycle.total_size_bytes
-                continue
-
-            # Alle Dateien des Zyklus loeschen
-            for file_path in cycle.get_all_files():
-                try:
-                    if file_path.exists():
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
-                        stats["deleted_files"] += 1
-                        stats["freed_bytes"] += file_size
-                        self.logger.info(f"    Geloescht: {file_path.name}")
-                except Exception as e:
-                    error_msg = f"Fehler beim Loeschen von {file_path}: {e}"
-                    self.logger.error(f"    {error_msg}")
-                    stats["errors"].append(error_msg)
+        with ThreadPoolExecutor(max_workers=_DELETE_WORKERS) as executor:
+            # Alle Loeschauftraege aller Zyklen vorab einreihen, damit die Platte
+            # ohne Pause zwischen den Zyklen durcharbeitet
+            cycle_jobs = []
+            for cycle in cycles_to_delete:
+                futures = {}
+                if not dry_run:
+                    futures = {
+                        executor.submit(self._delete_entry, entry): entry
+                        for entry in cycle.get_all_files(self._dir_index)
+                    }
+                cycle_jobs.append((cycle, futures))
+
+            for cycle, futures in cycle_jobs:
+                self.logger.info(f"  Loesche Zyklus vom {cycle.timestamp.strftime('%Y-%m-%d %H:%M')}")
+                self.logger.info(f"    Vollbackup: {cycle.full_backup.name}")
+                self.logger.info(f"    Differentials: {len(cycle.differentials)}")
+                self.logger.info(f"    Groesse: {self._format_size(cycle.total_size_bytes)}")
+
+                if dry_run:
+                    self.logger.info(f"    [DRY-RUN] Wuerde loeschen")
+                    stats["freed_bytes"] += cycle.total_size_bytes
+                    continue
+
+                # Ergebnisse des Zyklus einsammeln
+                for future in as_completed(futures):
+                    entry = futures[future]
+                    try:
+                        file_size = future.result()
+                    except FileNotFoundError:
+                        # Bereits geloescht
+                        continue
+                    except Exception as e:
+                        error_msg = f"Fehler beim Loeschen von {entry.path}: {e}"
+                        self.logger.error(f"    {error_msg}")
+                        stats["errors"].append(error_msg)
+                        continue
+                    stats["deleted_files"] += 1
+                    stats["freed_bytes"] += file_size
+                    self.logger.info(f"    Geloescht: {entry.name}")
+
+        # Index und Zyklen sind nach dem Loeschen veraltet
+        if not dry_run:
+            self._invalidate_caches()
 
         self.logger.info(f"  Cleanup abgeschlossen: {stats['deleted_files']} Dateien, {self._format_size(stats['freed_bytes'])} freigegeben")
 
@@ -862,12 +1227,98 @@ class SummaryGenerator:
 
     def __init__(self, config: dict):
         self.config = config
-        self.computer_name = config.get("hostname") or socket.gethostname()
+        self.computer_name = config.get("hostname") or _get_hostname()
+
+        # Persistente HTTP(S)-Verbindung zum API-Endpoint (wird beim ersten POST aufgebaut)
+        self._conn = None
+        self._request_target = None
+        self._proxy_headers = {}
+        # Erst nach einer vollstaendigen Antwort gilt die Verbindung als wiederverwendet
+        self._conn_reused = False
+
+        # Multipart boundary, muss nur innerhalb eines Requests eindeutig sein
+        self._boundary = f"----snapcontrol{secrets.token_hex(8)}"
+
+        # Fester Teil des Multipart-Bodys vor und nach den JSON-Daten
+        boundary = self._boundary
+        self._multipart_head = (
+            # hostname Feld
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="hostname"\r\n\r\n'
+            f"{self.computer_name}"
+            # backup_type Feld - immer "snapcontrol-v1"
+            f"\r\n--{boundary}\r\n"
+            'Content-Disposition: form-data; name="backup_type"\r\n\r\n'
+            "snapcontrol-v1"
+            # backuplog Datei
+            f"\r\n--{boundary}\r\n"
+            'Content-Disposition: form-data; name="backuplog"; filename="backup.json"\r\n'
+            "Content-Type: application/json\r\n\r\n"
+        ).encode("utf-8")
+        # Abschluss
+        self._multipart_tail = f"\r\n--{boundary}--\r\n".encode()
 
-    def generate(self, result: BackupResult, log_entries: list,
+    def _get_connection(self, endpoint: str):
+        """
+        Gibt die (gehaltene) Verbindung zum Endpoint zurueck sowie das Request-Ziel
+        und zusaetzliche Proxy-Header
+        Proxys wie bei urllib: HTTP(S)_PROXY/NO_PROXY bzw. unter Windows die Systemeinstellung
+        """
+        if self._conn is None:
+            url = urlsplit(endpoint)
+            https = url.scheme == "https"
+            conn_class = http.client.HTTPSConnection if https else http.client.HTTPConnection
+            path = url.path or "/"
+            if url.query:
+                path += f"?{url.query}"
+
+            proxy = urllib.request.getproxies().get(url.scheme)
+            if proxy and urllib.request.proxy_bypass(url.hostname):
+                proxy = None
+
+            self._proxy_headers = {}
+            if proxy:
+                if "://" not in proxy:
+                    proxy = f"http://{proxy}"
+                proxy_url = urlsplit(proxy)
+                if proxy_url.username is not None:
+                    credentials = f"{unquote(proxy_url.username)}:{unquote(proxy_url.password or '')}"
+                    self._proxy_headers["Proxy-Authorization"] = (
+                        "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii"))
+                # Ohne Port wie urllib den Standardport der Verbindungsklasse verwenden,
+                # groessere Sendebloecke als die 8 KiB Standard
+                self._conn = conn_class(proxy_url.hostname, proxy_url.port,
+                                        timeout=30, blocksize=64 * 1024)
+                if https:
+                    # HTTPS per CONNECT-Tunnel, Proxy-Auth nur beim Tunnelaufbau
+                    self._conn.set_tunnel(url.hostname, url.port, headers=self._proxy_headers)
+                    self._proxy_headers = {}
+                else:
+                    # HTTP-Proxys erwarten die absolute URL als Request-Ziel
+                    path = f"{url.scheme}://{url.netloc}{path}"
+            else:
+                self._conn = conn_class(url.hostname, url.port, timeout=30, blocksize=64 * 1024)
+            self._request_target = path
+        return self._conn, self._request_target, self._proxy_headers
+
+    def _close_connection(self):
+        """Schliesst die gehaltene Verbindung"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self._request_target = None
+            self._conn_reused = False
+
+    def generate(self, result: BackupResult, logger: BackupLogger,
                  disk_info: DiskSpaceInfo = None, cycles_count: int = 0,
                  keep_cycles: int = 0) -> dict:
-        """Generiert die API-Zusammenfassung"""
+        """Generiert die API-Zusammenfassung (Log-Eintraege und Zaehler aus dem Logger)"""
+        log_entries = logger.entries
+        if disk_info is None:
+            disk_info = _EMPTY_DISK_INFO
+        total_bytes = disk_info.total_bytes
+        free_bytes = disk_info.free_bytes
+
         summary = {
             "version": "1.0",
             "generated_at": datetime.now().isoformat(),
@@ -898,31 +1349,47 @@ class SummaryGenerator:
                 "drive_letter": result.disk_drive_letter
             },
             "storage": {
-                "total_bytes": disk_info.total_bytes if disk_info else 0,
-                "free_bytes": disk_info.free_bytes if disk_info else 0,
-                "used_bytes": disk_info.used_bytes if disk_info else 0,
-                "free_percent": round((disk_info.free_bytes / disk_info.total_bytes * 100), 1) if disk_info and disk_info.total_bytes > 0 else 0,
-                "last_cycle_size_bytes": disk_info.last_cycle_size_bytes if disk_info else 0,
+                "total_bytes": total_bytes,
+                "free_bytes": free_bytes,
+                "used_bytes": disk_info.used_bytes,
+                "free_percent": round((free_bytes / total_bytes * 100), 1) if total_bytes > 0 else 0,
+                "last_cycle_size_bytes": disk_info.last_cycle_size_bytes,
                 "cycles_count": cycles_count,
                 "cycles_max": keep_cycles
             },
             "log_summary": {
                 "total_entries": len(log_entries),
-                "errors": len([e for e in log_entries if e["level"] == "ERROR"]),
-                "warnings": len([e for e in log_entries if e["level"] == "WARNING"]),
+                "errors": logger.error_count,
+                "warnings": logger.warning_count,
             },
             "log_entries": log_entries
         }
         return summary
 
-    def save(self, summary: dict, path: Path):
-        """Speichert die Zusammenfassung"""
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+    def _serialize_wire(self, summary: dict) -> bytes:
+        """Serialisiert die Zusammenfassung einmalig (kompakt) fuer Datei und API"""
+        return _dumps_compact(summary)
+
+    def _serialize_pretty(self, summary: dict) -> bytes:
+        """Serialisiert die Zusammenfassung eingerueckt (nur fuer die Datei)"""
+        return _dumps(summary)
+
+    def save(self, summary: dict, path: Path, payload: bytes = None):
+        """
+        Speichert die Zusammenfassung
+        Standardmaessig werden die bereits serialisierten Bytes (payload) geschrieben,
+        eingerueckt nur mit log_settings.pretty_summary
+        """
+        if self.config.get("log_settings", {}).get("pretty_summary", False):
+            payload = self._serialize_pretty(summary)
+        elif payload is None:
+            payload = self._serialize_wire(summary)
+        _write_bytes(path, payload)
 
-    def post_to_api(self, summary: dict, logger) -> tuple[bool, str]:
+    def post_to_api(self, payload: bytes, logger) -> tuple[bool, str]:
         """
         Postet Zusammenfassung an HTTP API
+        payload: mit _serialize_wire() erzeugtes JSON der Zusammenfassung
         API erwartet multipart/form-data mit hostname, backuplog (JSON-Datei), backup_type
         backup_type ist immer "snapcontrol-v1", die eigentliche Backup-Art (full/differential)
         ist in der JSON unter backup.type enthalten
@@ -935,62 +1402,44 @@ class SummaryGenerator:
         token = api_config.get("token", "")
 
         try:
-            import urllib.request
-            import urllib.error
-            import uuid
-
-            # Multipart boundary generieren
-            boundary = f"----WebKitFormBoundary{uuid.uuid4().hex[:16]}"
-
-            # JSON-Daten als "Datei"
-            json_data = json.dumps(summary, indent=2, ensure_ascii=False).encode("utf-8")
-
-            # Multipart body erstellen
-            body_parts = []
-
-            # hostname Feld
-            body_parts.append(f"--{boundary}".encode())
-            body_parts.append(b'Content-Disposition: form-data; name="hostname"')
-            body_parts.append(b"")
-            body_parts.append(self.computer_name.encode("utf-8"))
-
-            # backup_type Feld - immer "snapcontrol-v1"
-            body_parts.append(f"--{boundary}".encode())
-            body_parts.append(b'Content-Disposition: form-data; name="backup_type"')
-            body_parts.append(b"")
-            body_parts.append(b"snapcontrol-v1")
-
-            # backuplog Datei
-            body_parts.append(f"--{boundary}".encode())
-            body_parts.append(b'Content-Disposition: form-data; name="backuplog"; filename="backup.json"')
-            body_parts.append(b"Content-Type: application/json")
-            body_parts.append(b"")
-            body_parts.append(json_data)
-
-            # Abschluss
-            body_parts.append(f"--{boundary}--".encode())
-            body_parts.append(b"")
-
-            body = b"\r\n".join(body_parts)
+            # Body mit einer einzigen Allokation exakter Groesse zusammensetzen,
+            # wird dann in einem Stueck an den Socket uebergeben
+            body = b"".join((self._multipart_head, payload, self._multipart_tail))
 
             headers = {
-                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Type": f"multipart/form-data; boundary={self._boundary}",
+                "Content-Length": str(len(body)),
                 "authorization": f"Bearer {token}"
             }
 
-            req = urllib.request.Request(endpoint, data=body, headers=headers, method="POST")
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                response_body = response.read().decode("utf-8")
-                if response.status in [200, 201]:
-                    return True, response_body
-                else:
-                    return False, f"Status {response.status}: {response_body}"
+            conn, path, proxy_headers = self._get_connection(endpoint)
+            headers.update(proxy_headers)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                    ConnectionResetError, BrokenPipeError):
+                # Nur eine bereits benutzte Verbindung kann inzwischen vom Server
+                # geschlossen worden sein; bei einer neuen Verbindung koennte der
+                # Server den POST schon verarbeitet haben -> nicht doppelt senden
+                if not self._conn_reused:
+                    raise
+                conn.close()
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+
+            response_body = response.read().decode("utf-8")
+            self._conn_reused = True
+            if response.status in [200, 201]:
+                return True, response_body
+            elif response.status >= 400:
+                return False, f"HTTP {response.status}: {response_body}"
+            else:
+                return False, f"Status {response.status}: {response_body}"
 
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else str(e)
-            return False, f"HTTP {e.code}: {error_body}"
         except Exception as e:
+            # Verbindung in unbekanntem Zustand -> beim naechsten Mal neu aufbauen
+            self._close_connection()
             return False, f"Fehler: {e}"
 
 
@@ -1095,7 +1544,7 @@ Beispiele:
             test_summary = {
                 "version": "1.0",
                 "generated_at": datetime.now().isoformat(),
-                "computer_name": config.get("hostname") or socket.gethostname(),
+                "computer_name": config.get("hostname") or _get_hostname(),
                 "backup": {
                     "success": True,
                     "type": "test",
@@ -1143,9 +1592,11 @@ Beispiele:
             }
 
             summary_gen = SummaryGenerator(config)
-            logger.info(f"Sende Test-Daten an: {config.get('api_settings', {}).get('endpoint')}")
+            payload = summary_gen._serialize_wire(test_summary)
+            logger.info(f"Sende Test-Daten ({len(payload)} Bytes) an: "
+                        f"{config.get('api_settings', {}).get('endpoint')}")
 
-            success, response = summary_gen.post_to_api(test_summary, logger)
+            success, response = summary_gen.post_to_api(payload, logger)
             if success:
                 logger.success(f"API-Verbindung erfolgreich!")
                 logger.info(f"Antwort: {response}")
@@ -1169,7 +1620,10 @@ Beispiele:
 
         # Logger neu initialisieren mit richtigem Pfad
         log_dir = target_disk.base_path / config["log_settings"]["log_dir"]
-        logger = BackupLogger(log_dir, session_id)
+        # Erst den neuen Logger anlegen: schlaegt das fehl, loggt der alte den Fehler
+        new_logger = BackupLogger(log_dir, session_id)
+        logger.close()
+        logger = new_logger
 
         # Backup-Manager mit Ziel-Laufwerk erstellen
         manager = BackupManager(config, logger, target_disk)
@@ -1241,20 +1695,23 @@ Beispiele:
         cycles = manager.get_backup_cycles()
         summary_gen = SummaryGenerator(config)
         summary = summary_gen.generate(
-            result, logger.entries,
+            result, logger,
             disk_info=final_disk_info,
             cycles_count=len(cycles),
             keep_cycles=manager.keep_cycles
         )
 
+        # Einmal serialisieren, fuer Datei und API
+        payload = summary_gen._serialize_wire(summary)
+
         summary_path = log_dir / f"summary_{session_id}.json"
-        summary_gen.save(summary, summary_path)
+        summary_gen.save(summary, summary_path, payload)
         logger.info(f"Zusammenfassung gespeichert: {summary_path}")
 
         # An API senden falls aktiviert
         if config.get("api_settings", {}).get("enabled"):
             logger.info("Sende an API...")
-            success, response = summary_gen.post_to_api(summary, logger)
+            success, response = summary_gen.post_to_api(payload, logger)
             if success:
                 logger.success(f"API-Upload erfolgreich: {response}")
             else:
@@ -1269,9 +1726,13 @@ Beispiele:
             logger.error("Backup-Vorgang mit Fehlern beendet")
             sys.exit(1)
 
+    except OSError as e:
+        # Erwartbare Dateisystemfehler (fehlende Datei, keine Rechte, Platte voll)
+        # ohne Traceback melden
+        logger.error(f"Dateisystemfehler: {e}")
+        sys.exit(1)
     except Exception as e:
         logger.error(f"Unerwarteter Fehler: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         sys.exit(1)
 